@@ -1,141 +1,387 @@
-from fastapi import FastAPI, Header, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
 from typing import Optional, List
+from contextlib import asynccontextmanager
 import os
+import hmac
+import hashlib
+import inspect
+import functools
 import datetime as dt
+import orjson
 import psycopg
-from psycopg.types.json import Json
+import redis
+import redis.asyncio
+from redis.exceptions import RedisError
+from celery import Celery
+from celery.result import AsyncResult
+from starlette.concurrency import run_in_threadpool
+from psycopg import sql
+from psycopg.types.json import Jsonb, set_json_dumps, set_json_loads
+from psycopg.types.numeric import FloatLoader
+from psycopg_pool import AsyncConnectionPool
 
-app = FastAPI(title="AscentPulse API")
+# JSON/JSONB params and columns go through orjson instead of stdlib json
+set_json_dumps(orjson.dumps)
+set_json_loads(orjson.loads)
 
 # ------------------ Auth helper ------------------
+_API_KEY = os.getenv("API_KEY")
+_EXPECTED_AUTH = f"Bearer {_API_KEY}".encode() if _API_KEY is not None else None
+
 def check_key(auth: Optional[str]):
     """Protects /jobs/* endpoints with a static bearer key."""
-    expected = os.getenv("API_KEY")
-    if expected is None:
+    if _EXPECTED_AUTH is None:
         return  # no auth if key not set (not recommended)
-    if auth != f"Bearer {expected}":
+    if not (auth and hmac.compare_digest(auth.encode(), _EXPECTED_AUTH)):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-# ------------------ DB helper ------------------
+# ------------------ DB pool ------------------
 DB_URL = os.getenv("DATABASE_URL")
 
-def db_conn():
+async def configure_conn(conn):
+    # numeric columns load as float, so rows go straight to orjson
+    conn.adapters.register_loader("numeric", FloatLoader)
+    # prepare on first execute: repeat queries skip parse+plan server-side
+    conn.prepare_threshold = 0
+
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "4"))
+DB_MAX_CONNS = int(os.getenv("DB_MAX_CONNS", "20"))  # budget shared by all workers
+DB_MIN_CONNS = int(os.getenv("DB_MIN_CONNS", "1"))  # per worker; idle conns above this are trimmed
+
+# Created per worker process in lifespan; handlers borrow warm connections
+# instead of paying a TCP+TLS+auth handshake per request.
+pool: Optional[AsyncConnectionPool] = None
+
+def db_pool() -> AsyncConnectionPool:
     if not DB_URL:
         raise HTTPException(status_code=500, detail="DATABASE_URL not set")
-    return psycopg.connect(DB_URL, autocommit=True)
+    return pool
+
+# ------------------ Response cache ------------------
+REDIS_URL = os.getenv("REDIS_URL")
+
+cache = redis.asyncio.from_url(REDIS_URL) if REDIS_URL else None  # caching off if not set
+sync_cache = redis.Redis.from_url(REDIS_URL) if REDIS_URL else None  # invalidation from workers
+
+def etag_response(body: bytes, request: Request) -> Response:
+    """JSON response tagged with sha1(body); 304 if the client already has it."""
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    inm = request.headers.get("if-none-match", "")
+    tags = {t.strip().removeprefix("W/") for t in inm.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+def cached(ttl: int):
+    """
+    Caches a read endpoint's JSON body in Redis for `ttl` seconds.
+    A non-expiring copy is kept under "stale:" and served if the DB errors,
+    including a pool checkout that times out (bounded by the pool's timeout).
+    Responses carry an ETag and honour If-None-Match.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        async def wrap(*args, request: Request, **kwargs):
+            if cache is None:
+                return etag_response(orjson.dumps(await fn(*args, **kwargs)), request)
+            key = f"{fn.__name__}:{kwargs}"
+            try:
+                hit = await cache.get(key)
+            except RedisError:
+                hit = None
+            if hit is not None:
+                return etag_response(hit, request)
+            try:
+                res = await fn(*args, **kwargs)
+            # DB down: the pool raises PoolTimeout (a psycopg.OperationalError)
+            # once its checkout timeout expires, so the stale copy goes out then
+            except psycopg.Error:
+                try:
+                    stale = await cache.get(f"stale:{key}")
+                except RedisError:
+                    stale = None
+                if stale is None:
+                    raise
+                return etag_response(stale, request)
+            body = orjson.dumps(res)
+            try:
+                async with cache.pipeline(transaction=False) as pipe:
+                    pipe.set(key, body, ex=ttl)
+                    pipe.set(f"stale:{key}", body)
+                    await pipe.execute()
+            except RedisError:
+                pass
+            return etag_response(body, request)
+        # expose `request` to FastAPI without adding it to the handler itself
+        sig = inspect.signature(fn)
+        wrap.__signature__ = sig.replace(parameters=[
+            *sig.parameters.values(),
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        ])
+        return wrap
+    return deco
+
+def invalidate(*names: str):
+    """Drops fresh cache entries for the given endpoints (stale copies stay)."""
+    if sync_cache is None:
+        return
+    try:
+        keys = [k for name in names for k in sync_cache.scan_iter(match=f"{name}:*")]
+        if keys:
+            sync_cache.delete(*keys)
+    except RedisError:
+        pass
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global pool
+    max_size = max(1, DB_MAX_CONNS // WEB_CONCURRENCY)
+    pool = AsyncConnectionPool(
+        DB_URL or "",
+        min_size=min(DB_MIN_CONNS, max_size),
+        max_size=max_size,
+        kwargs={"autocommit": True},
+        configure=configure_conn,
+        # Neon/RDS Proxy reap idle conns: check_connection validates each conn
+        # on checkout so callers never get a dead one; max_idle closes conns
+        # idle for 5 min, but only while the pool is above min_size.
+        max_idle=300,
+        check=AsyncConnectionPool.check_connection,
+        reconnect_timeout=5,
+        timeout=5,  # max wait for a conn on checkout before PoolTimeout
+        open=False,
+    )
+    if DB_URL:
+        await pool.open()
+    yield
+    await pool.close()
+    if cache is not None:
+        await cache.aclose()
+
+app = FastAPI(title="AscentPulse API", lifespan=lifespan)
 
 # ------------------ Root / Health ------------------
+# Static bodies are serialized once at import and the same Response reused.
+def _static(payload: dict) -> Response:
+    return Response(orjson.dumps(payload), media_type="application/json")
+
+_ROOT_RESP = _static({"ok": True, "service": "ascentpulse-api"})
+_HEALTH_DB_OK = _static({"status": "healthy", "db": True})
+_HEALTH_DB_DOWN = _static({"status": "healthy", "db": False})
+
 @app.get("/")
-def root():
-    return {"ok": True, "service": "ascentpulse-api"}
+async def root():
+    return _ROOT_RESP
 
 @app.get("/health")
-def health():
+async def health():
     db_ok = False
     try:
-        with db_conn() as conn, conn.cursor() as cur:
-            cur.execute("select 1")
-            cur.fetchone()
+        async with db_pool().connection(timeout=2) as conn:
+            await conn.execute("select 1")
         db_ok = True
     except Exception:
         db_ok = False
-    return {"status": "healthy", "db": db_ok}
+    return _HEALTH_DB_OK if db_ok else _HEALTH_DB_DOWN
 
 # ------------------ READ endpoints for UI ------------------
+# served when the tables are still empty
+REGIME_FALLBACK = {"date": "today", "regime": "RISK_ON", "confidence": 0.62}
+SCORES_FALLBACK = {
+    "asof": "today",
+    "items": [
+        {"symbol": "SOLUSDT", "score": 78.4, "why": ["RS strong", "positive basis"]},
+        {"symbol": "INJUSDT", "score": 75.1, "why": ["OBV ↑", "VWAP reclaim"]},
+    ],
+}
+
+# Queries are module-level bytes so psycopg skips the per-call str encode;
+# repeat executes send only Bind + Execute because of prepare_threshold=0.
+SQL_REGIME_TODAY = b"""
+    select asof, regime, confidence
+    from market_state_daily
+    order by asof desc
+    limit 1
+"""
+
+SQL_TOP10 = b"""
+    with latest as (select max(asof) as asof from score_daily)
+    select s.asof, s.symbol, s.score, s.rank, s.reasons
+    from score_daily s
+    join latest l on s.asof = l.asof
+    order by s.rank asc nulls last, s.score desc
+    limit 10
+"""
+
+SQL_SIGNALS_RECENT = b"""
+    select ts, symbol, trigger, entry, stop, tp1, tp2, regime, score, status
+    from signal_4h
+    where ts > now() - interval '7 days'
+    order by ts desc, created_at desc
+    limit %s
+"""
+
+# regime + top10 assembled as one JSON document by Postgres
+SQL_DASHBOARD = b"""
+    with r as (
+        select asof as date, regime, confidence
+        from market_state_daily
+        order by asof desc
+        limit 1
+    ), latest as (
+        select max(asof) as asof from score_daily
+    ), t as (
+        select s.symbol, s.score, s.rank, coalesce(s.reasons, '[]') as why
+        from score_daily s
+        join latest l on s.asof = l.asof
+        order by s.rank asc nulls last, s.score desc
+        limit 10
+    )
+    select json_build_object(
+        'regime', (select row_to_json(r) from r),
+        'top10', json_build_object(
+            'asof', (select asof from latest),
+            'items', (
+                select coalesce(json_agg(t order by t.rank asc nulls last, t.score desc), '[]')
+                from t
+            )
+        )
+    )
+"""
+
 @app.get("/regime/today")
-def regime_today():
+@cached(ttl=60)
+async def regime_today():
     """
     Returns latest regime snapshot from market_state_daily,
     falls back to a stub if table empty.
     """
-    with db_conn() as conn, conn.cursor() as cur:
-        cur.execute("""
-            select asof, regime, confidence
-            from market_state_daily
-            order by asof desc
-            limit 1
-        """)
-        row = cur.fetchone()
+    async with db_pool().connection() as conn, conn.cursor() as cur:
+        await cur.execute(SQL_REGIME_TODAY)
+        row = await cur.fetchone()
     if row:
         asof, regime, conf = row
-        return {"date": str(asof), "regime": regime, "confidence": float(conf) if conf is not None else None}
-    # fallback if empty
-    return {"date": "today", "regime": "RISK_ON", "confidence": 0.62}
+        return {"date": asof, "regime": regime, "confidence": conf}
+    return REGIME_FALLBACK
 
 @app.get("/scores/top10")
-def scores_top10():
+@cached(ttl=30)
+async def scores_top10():
     """
     Returns top-10 by latest asof from score_daily.
     """
-    with db_conn() as conn, conn.cursor() as cur:
-        cur.execute("""
-            with latest as (select max(asof) as asof from score_daily)
-            select s.asof, s.symbol, s.score, s.rank, s.reasons
-            from score_daily s
-            join latest l on s.asof = l.asof
-            order by s.rank asc nulls last, s.score desc
-            limit 10
-        """)
-        rows = cur.fetchall()
+    async with db_pool().connection() as conn, conn.cursor() as cur:
+        await cur.execute(SQL_TOP10)
+        rows = await cur.fetchall()
     if not rows:
-        # fallback demo if empty
-        return {
-            "asof": "today",
-            "items": [
-                {"symbol": "SOLUSDT", "score": 78.4, "why": ["RS strong", "positive basis"]},
-                {"symbol": "INJUSDT", "score": 75.1, "why": ["OBV ↑", "VWAP reclaim"]},
-            ],
-        }
+        return SCORES_FALLBACK
     items = []
     latest_asof = None
     for asof, sym, score, rnk, reasons in rows:
         latest_asof = asof
         items.append({
             "symbol": sym,
-            "score": float(score) if score is not None else None,
+            "score": score,
             "rank": rnk,
             "why": reasons if reasons else []
         })
-    return {"asof": str(latest_asof), "items": items}
+    return {"asof": latest_asof, "items": items}
 
 @app.get("/signals/recent")
-def signals_recent(limit: int = 50):
+@cached(ttl=5)
+async def signals_recent(limit: int = Query(50, ge=1, le=500)):
     """
-    Returns recent 4H signals from signal_4h.
+    Returns recent 4H signals (last 7 days) from signal_4h.
     """
-    with db_conn() as conn, conn.cursor() as cur:
-        cur.execute("""
-            select ts, symbol, trigger, entry, stop, tp1, tp2, regime, score, status
-            from signal_4h
-            order by ts desc nulls last, created_at desc
-            limit %s
-        """, (limit,))
-        rows = cur.fetchall()
+    async with db_pool().connection() as conn, conn.cursor() as cur:
+        await cur.execute(SQL_SIGNALS_RECENT, (limit,))
+        rows = await cur.fetchall()
     items = []
     for (ts, sym, trig, entry, stop, tp1, tp2, regime, score, status) in rows:
         items.append({
-            "ts": ts.isoformat() if ts else None,
+            "ts": ts,
             "symbol": sym,
             "trigger": trig,
-            "entry": float(entry) if entry is not None else None,
-            "stop": float(stop) if stop is not None else None,
-            "tp1": float(tp1) if tp1 is not None else None,
-            "tp2": float(tp2) if tp2 is not None else None,
+            "entry": entry,
+            "stop": stop,
+            "tp1": tp1,
+            "tp2": tp2,
             "regime": regime,
-            "score": float(score) if score is not None else None,
+            "score": score,
             "status": status
         })
     return {"items": items}
 
-# ------------------ JOB endpoints (Cron targets) ------------------
-@app.post("/jobs/hygiene")
-def job_hygiene(authorization: Optional[str] = Header(None)):
+@app.get("/dashboard")
+@cached(ttl=30)
+async def dashboard():
+    """
+    Returns /regime/today and /scores/top10 together,
+    fetched in one round trip.
+    """
+    async with db_pool().connection() as conn, conn.cursor() as cur:
+        await cur.execute(SQL_DASHBOARD)
+        (data,) = await cur.fetchone()
+    if data["regime"] is None:
+        data["regime"] = REGIME_FALLBACK
+    if not data["top10"]["items"]:
+        data["top10"] = SCORES_FALLBACK
+    return data
+
+# ------------------ Background tasks (Celery) ------------------
+# Worker: celery -A main.celery worker
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", REDIS_URL or "redis://localhost:6379/0")
+# separate from the broker: not every broker URL (e.g. amqp://) is a result backend
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", REDIS_URL or "redis://localhost:6379/0")
+
+celery = Celery("ascentpulse", broker=CELERY_BROKER_URL, backend=CELERY_RESULT_BACKEND)
+
+def db_conn():
+    if not DB_URL:
+        raise RuntimeError("DATABASE_URL not set")
+    return psycopg.connect(DB_URL, autocommit=True)
+
+SQL_UPSERT_REGIME = b"""
+    insert into market_state_daily
+        (asof, btc_trend, eth_trend, breadth_pct, stables_flow_pct, regime, confidence)
+    values (%s,%s,%s,%s,%s,%s,%s)
+    on conflict (asof) do update
+    set btc_trend=excluded.btc_trend,
+        eth_trend=excluded.eth_trend,
+        breadth_pct=excluded.breadth_pct,
+        stables_flow_pct=excluded.stables_flow_pct,
+        regime=excluded.regime,
+        confidence=excluded.confidence
+"""
+
+# {} is filled with one (%s,...) group per row
+SQL_UPSERT_SCORES = sql.SQL("""
+    insert into score_daily (asof, symbol, score, reasons, rank)
+    values {}
+    on conflict (asof, symbol) do update
+    set score=excluded.score,
+        reasons=excluded.reasons,
+        rank=excluded.rank
+""")
+
+SQL_COPY_SIGNALS = b"""
+    copy signal_4h (ts, symbol, trigger, entry, stop, tp1, tp2, regime, score)
+    from stdin
+"""
+
+SQL_INSERT_DERIVS = b"""
+    insert into derivs_hourly
+        (ts, symbol, oi_usd, oi_1h_chg, funding_8h, basis_pct, liq_up_m, liq_dn_m, spot_leads)
+    values (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+"""
+
+@celery.task
+def run_hygiene():
     """
     Upserts today's regime snapshot.
     Replace the payload with real calculations later.
     """
-    check_key(authorization)
-    today = dt.date.today()
+    today = dt.datetime.now(dt.timezone.utc).date()
     payload = {
         "btc_trend": "UP",
         "eth_trend": "UP",
@@ -145,94 +391,132 @@ def job_hygiene(authorization: Optional[str] = Header(None)):
         "confidence": 0.63
     }
     with db_conn() as conn, conn.cursor() as cur:
-        cur.execute("""
-            insert into market_state_daily
-                (asof, btc_trend, eth_trend, breadth_pct, stables_flow_pct, regime, confidence)
-            values (%s,%s,%s,%s,%s,%s,%s)
-            on conflict (asof) do update
-            set btc_trend=excluded.btc_trend,
-                eth_trend=excluded.eth_trend,
-                breadth_pct=excluded.breadth_pct,
-                stables_flow_pct=excluded.stables_flow_pct,
-                regime=excluded.regime,
-                confidence=excluded.confidence
-        """, (
+        cur.execute(SQL_UPSERT_REGIME, (
             today,
             payload["btc_trend"], payload["eth_trend"],
             payload["breadth_pct"], payload["stables_flow_pct"],
             payload["regime"], payload["confidence"]
         ))
+    invalidate("regime_today", "dashboard")
     return {"ok": True, "job": "hygiene"}
 
-@app.post("/jobs/score")
-def job_score(authorization: Optional[str] = Header(None)):
+@celery.task
+def run_score():
     """
     Upserts today's top scores (example rows).
     Replace 'top' with your scoring outputs later.
     """
-    check_key(authorization)
-    today = dt.date.today()
+    today = dt.datetime.now(dt.timezone.utc).date()
     top: List[tuple] = [
         ("SOLUSDT", 78.4, 1, ["RS strong", "positive basis"]),
         ("INJUSDT", 75.1, 2, ["OBV ↑", "VWAP reclaim"]),
         ("TIAUSDT", 73.2, 3, ["AVWAP reclaim"]),
     ]
-    with db_conn() as conn, conn.cursor() as cur:
-        for sym, score, rnk, why in top:
-            cur.execute("""
-                insert into score_daily (asof, symbol, score, reasons, rank)
-                values (%s,%s,%s,%s,%s)
-                on conflict (asof, symbol) do update
-                set score=excluded.score,
-                    reasons=excluded.reasons,
-                    rank=excluded.rank
-            """, (today, sym, score, Json(why), rnk))
-    return {"ok": True, "job": "score", "count": len(top)}
-
-@app.post("/jobs/trigger4h")
-def job_trigger4h(authorization: Optional[str] = Header(None)):
+    rows = [(today, sym, score, Jsonb(why), rnk) for sym, score, rnk, why in top]
+    count = 0
+    if rows:
+        # one multi-row statement: a single round trip and a single ON CONFLICT pass
+        values = sql.SQL(", ").join(sql.SQL("(%s,%s,%s,%s,%s)") for _ in rows)
+        query = SQL_UPSERT_SCORES.format(values)
+        with db_conn() as conn, conn.cursor() as cur:
+            cur.execute(query, [p for row in rows for p in row])
+            count = cur.rowcount
+    invalidate("scores_top10", "dashboard")
+    return {"ok": True, "job": "score", "count": count}
+
+@celery.task
+def run_trigger4h():
     """
     Inserts example 4H triggers. Replace with real detection logic later.
     """
-    check_key(authorization)
-    now = dt.datetime.utcnow().replace(microsecond=0)
+    now = dt.datetime.now(dt.timezone.utc).replace(microsecond=0)
     sample = [
         (now, "SOLUSDT", "sweep→CHoCH→retest", 178.20, 169.50, 189.00, 198.00, "RISK_ON", 78.4),
         (now, "INJUSDT",  "AVWAP reclaim",      31.10,  28.90,  34.50,  37.00, "RISK_ON", 75.1),
     ]
     with db_conn() as conn, conn.cursor() as cur:
-        for ts, sym, trig, entry, stop, tp1, tp2, regime, score in sample:
-            cur.execute("""
-                insert into signal_4h
-                    (ts, symbol, trigger, entry, stop, tp1, tp2, regime, score)
-                values (%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """, (ts, sym, trig, entry, stop, tp1, tp2, regime, score))
-    return {"ok": True, "job": "trigger4h", "count": len(sample)}
+        with cur.copy(SQL_COPY_SIGNALS) as cp:
+            for row in sample:
+                cp.write_row(row)
+        count = cur.rowcount  # rows written by COPY
+    invalidate("signals_recent")
+    return {"ok": True, "job": "trigger4h", "count": count}
 
-@app.post("/jobs/derivs")
-def job_derivs(authorization: Optional[str] = Header(None)):
+@celery.task
+def run_derivs():
     """
     Inserts example hourly derivatives snapshot.
     Replace with real OI/funding/basis pulls later.
     """
-    check_key(authorization)
-    now = dt.datetime.utcnow().replace(minute=10, second=0, microsecond=0)  # align to :10
+    now = dt.datetime.now(dt.timezone.utc).replace(minute=10, second=0, microsecond=0)  # align to :10
     rows = [
         (now, "SOLUSDT", 980_000_000, 25_000_000, 0.004, 0.35, 18.0, 22.0, True),
         (now, "INJUSDT", 210_000_000,  6_000_000, 0.002, 0.20,  5.5,  7.2, False),
     ]
     with db_conn() as conn, conn.cursor() as cur:
-        for (ts, sym, oi_usd, oi_chg, funding, basis, liq_up, liq_dn, spot_leads) in rows:
-            cur.execute("""
-                insert into derivs_hourly
-                    (ts, symbol, oi_usd, oi_1h_chg, funding_8h, basis_pct, liq_up_m, liq_dn_m, spot_leads)
-                values (%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """, (ts, sym, oi_usd, oi_chg, funding, basis, liq_up, liq_dn, spot_leads))
-    return {"ok": True, "job": "derivs", "count": len(rows)}
+        cur.executemany(SQL_INSERT_DERIVS, rows)
+        count = cur.rowcount  # summed over all rows by executemany
+    return {"ok": True, "job": "derivs", "count": count}
+
+# ------------------ JOB endpoints (Cron targets) ------------------
+async def enqueue(task):
+    # publishing to the broker is blocking I/O; keep it off the event loop
+    res = await run_in_threadpool(task.delay)
+    return {"ok": True, "task_id": res.id}
+
+@app.post("/jobs/hygiene", status_code=202)
+async def job_hygiene(authorization: Optional[str] = Header(None)):
+    """Queues run_hygiene; poll GET /jobs/{task_id} for the result."""
+    check_key(authorization)
+    return await enqueue(run_hygiene)
+
+@app.post("/jobs/score", status_code=202)
+async def job_score(authorization: Optional[str] = Header(None)):
+    """Queues run_score; poll GET /jobs/{task_id} for the result."""
+    check_key(authorization)
+    return await enqueue(run_score)
+
+@app.post("/jobs/trigger4h", status_code=202)
+async def job_trigger4h(authorization: Optional[str] = Header(None)):
+    """Queues run_trigger4h; poll GET /jobs/{task_id} for the result."""
+    check_key(authorization)
+    return await enqueue(run_trigger4h)
+
+@app.post("/jobs/derivs", status_code=202)
+async def job_derivs(authorization: Optional[str] = Header(None)):
+    """Queues run_derivs; poll GET /jobs/{task_id} for the result."""
+    check_key(authorization)
+    return await enqueue(run_derivs)
+
+@app.get("/jobs/{task_id}")
+def job_status(task_id: str, authorization: Optional[str] = Header(None)):
+    """
+    Reports a queued job's state, plus its result once finished.
+    Plain def: result-backend reads block, so this runs in the threadpool.
+    """
+    check_key(authorization)
+    res = AsyncResult(task_id, app=celery)
+    body = {"task_id": task_id, "status": res.state}
+    if res.successful():
+        body["result"] = res.result
+    elif res.failed():
+        body["error"] = str(res.result)
+    return body
 
 # ------------------ Admin / test ------------------
 @app.post("/alerts/test")
-def alerts_test(authorization: Optional[str] = Header(None)):
+async def alerts_test(authorization: Optional[str] = Header(None)):
     check_key(authorization)
     # Later: push Telegram/email. For now, ack.
     return {"ok": True, "sent": True}
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        workers=WEB_CONCURRENCY,
+    )
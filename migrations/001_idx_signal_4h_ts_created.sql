@@ -0,0 +1,4 @@
+-- Serves /signals/recent: range scan on ts + LIMIT, no sort step.
+-- CONCURRENTLY cannot run inside a transaction block; run this on its own.
+create index concurrently if not exists idx_signal_4h_ts_created
+    on signal_4h (ts desc, created_at desc);